@@ -0,0 +1,91 @@
+# cython: language_level=3
+"""
+Compiled (Cython + OpenMP) version of the fused per-triangle kernel.
+Same conventions and in-place outputs as geometric_calculation.per_triangle_metrics;
+built by setup.py when Cython is available at install time.
+"""
+cimport cython
+from cython.parallel cimport prange
+from libc.math cimport sqrt, atan2, fmin, fmax, NAN
+
+ctypedef fused real:
+    float
+    double
+
+cdef double SQRT3 = sqrt(3.0)
+cdef double RAD2DEG = 57.29577951308232
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef void per_tri(const real[:, ::1] V, const int[:, ::1] F,
+                  float[::1] a, float[::1] b, float[::1] c, float[::1] area,
+                  float[::1] A, float[::1] B, float[::1] C,
+                  float[::1] sq, float[::1] rr) noexcept nogil:
+    cdef Py_ssize_t i, M = F.shape[0]
+    cdef int i0, i1, i2
+    cdef double e0x, e0y, e0z, e1x, e1y, e1z, e2x, e2y, e2z
+    cdef double a2, b2, c2, la, lb, lc, cx, cy, cz, ar
+    cdef double denom, q, s, abc, r
+
+    for i in prange(M, schedule="static"):
+        i0 = F[i, 0]
+        i1 = F[i, 1]
+        i2 = F[i, 2]
+
+        # e0 = v2 - v1, e1 = v0 - v2, e2 = v1 - v0
+        e0x = V[i2, 0] - V[i1, 0]; e0y = V[i2, 1] - V[i1, 1]; e0z = V[i2, 2] - V[i1, 2]
+        e1x = V[i0, 0] - V[i2, 0]; e1y = V[i0, 1] - V[i2, 1]; e1z = V[i0, 2] - V[i2, 2]
+        e2x = V[i1, 0] - V[i0, 0]; e2y = V[i1, 1] - V[i0, 1]; e2z = V[i1, 2] - V[i0, 2]
+
+        a2 = e0x*e0x + e0y*e0y + e0z*e0z
+        b2 = e1x*e1x + e1y*e1y + e1z*e1z
+        c2 = e2x*e2x + e2y*e2y + e2z*e2z
+        la = sqrt(a2)
+        lb = sqrt(b2)
+        lc = sqrt(c2)
+
+        # area = 0.5 * || e2 x e0 ||
+        cx = e2y*e0z - e2z*e0y
+        cy = e2z*e0x - e2x*e0z
+        cz = e2x*e0y - e2y*e0x
+        ar = 0.5 * sqrt(cx*cx + cy*cy + cz*cz)
+
+        # shape_quality
+        denom = a2 + b2 + c2
+        q = 4.0 * SQRT3 * ar / denom if denom > 0 else 0.0
+
+        # radius_ratio = 2*r_in/R_circ = 8*Area^2 / (s*a*b*c)
+        s = 0.5 * (la + lb + lc)
+        abc = la * lb * lc
+        r = 8.0 * ar * ar / (s * abc) if (ar > 1e-12 and s > 0 and abc > 0) else 0.0
+
+        a[i] = <float>la
+        b[i] = <float>lb
+        c[i] = <float>lc
+        area[i] = <float>ar
+        # A = atan2(4*Area, b^2 + c^2 - a^2)
+        if a2 > 0 and b2 > 0 and c2 > 0:
+            A[i] = <float>(atan2(4.0 * ar, b2 + c2 - a2) * RAD2DEG)
+            B[i] = <float>(atan2(4.0 * ar, c2 + a2 - b2) * RAD2DEG)
+            C[i] = <float>(atan2(4.0 * ar, a2 + b2 - c2) * RAD2DEG)
+        else:
+            # 有零长边（重复顶点）时内角无定义
+            A[i] = NAN
+            B[i] = NAN
+            C[i] = NAN
+        sq[i] = <float>fmax(0.0, fmin(1.0, q))
+        rr[i] = <float>fmax(0.0, fmin(1.0, r))
+
+
+def per_triangle_metrics(const real[:, ::1] V, const int[:, ::1] F,
+                         float[::1] a, float[::1] b, float[::1] c, float[::1] area,
+                         float[::1] A, float[::1] B, float[::1] C,
+                         float[::1] sq, float[::1] rr):
+    """
+    Outputs are written in place:
+        a, b, c, area, A, B, C, sq, rr: preallocated float32 (M,) arrays
+    """
+    with nogil:
+        per_tri(V, F, a, b, c, area, A, B, C, sq, rr)
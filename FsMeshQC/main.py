@@ -179,7 +179,7 @@ def main():
     
     # 低质量三角形统计
     bad_mask = (q["shape_quality"] < args.bad_sq_thresh) | (q["min_angle"] < args.bad_angle_thresh)
-    bad_count = np.sum(bad_mask)
+    bad_count = np.count_nonzero(bad_mask)
     total_count = F.shape[0]
     bad_percent = (bad_count / total_count) * 100
     print(f"低质量三角形: {bad_count}/{total_count} ({bad_percent:.2f}%)")
@@ -199,5 +199,6 @@ def main():
         save_npz=args.npz,
         save_summary_json=args.json,
         bad_sq_thresh=args.bad_sq_thresh,
-        bad_minangle_thresh=args.bad_angle_thresh
+        bad_minangle_thresh=args.bad_angle_thresh,
+        bad_mask=bad_mask
     )
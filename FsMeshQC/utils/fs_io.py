@@ -5,8 +5,11 @@ def read_freesurfer_surf(path):
     """
     Read FreeSurfer .surf files (e.g., lh.white, rh.pial).
     Returns:
-        V: (N,3) float64 vertex coordinates (mm, RAS)
+        V: (N,3) float32 vertex coordinates (mm, RAS)
         F: (M,3) int32   triangle face vertex indices (0-based)
     """
-    V, F = nib.freesurfer.read_geometry(path)
-    return V.astype(np.float64), F.astype(np.int32)
+    V_raw, F_raw = nib.freesurfer.read_geometry(path)
+    # 仅在 dtype / 内存布局不符时才复制
+    V = np.ascontiguousarray(V_raw, dtype=np.float32)
+    F = np.ascontiguousarray(F_raw, dtype=np.int32)
+    return V, F
@@ -1,13 +1,22 @@
+import functools
+import math
 import numpy as np
 
+try:
+    from numba import njit, prange, void, float32, float64, int32
+    HAS_NUMBA = True
+except ImportError:  # numba 为可选依赖，缺失时走纯 numpy 路径
+    HAS_NUMBA = False
+
 
 def triangle_edges(V, F):
     """
-    Calculate triangle edge vectors and lengths.
+    Calculate triangle edge vectors and squared lengths.
     Returns:
         e0, e1, e2: (M,3) Edge vectors
-        a,  b,  c : (M,)  Edge lengths, where:
-        a = ||e0||, b = ||e1||, c = ||e2||
+        a2, b2, c2: (M,)  Squared edge lengths, where:
+        a2 = ||e0||^2, b2 = ||e1||^2, c2 = ||e2||^2
+    Lengths themselves are np.sqrt(a2) etc., taken only where needed.
     Convention: Opposite vertices:
         e0 = v2 - v1 (corresponding to length a)
         e1 = v0 - v2 (corresponding to length b)
@@ -21,10 +30,10 @@ def triangle_edges(V, F):
     e1 = v0 - v2
     e2 = v1 - v0
 
-    a = np.linalg.norm(e0, axis=1)
-    b = np.linalg.norm(e1, axis=1)
-    c = np.linalg.norm(e2, axis=1)
-    return e0, e1, e2, a, b, c
+    a2 = np.einsum('ij,ij->i', e0, e0)
+    b2 = np.einsum('ij,ij->i', e1, e1)
+    c2 = np.einsum('ij,ij->i', e2, e2)
+    return e0, e1, e2, a2, b2, c2
 
 def triangle_area_from_edges(e2, e0):
     """
@@ -33,46 +42,163 @@ def triangle_area_from_edges(e2, e0):
     where:
         e2 = v1 - v0, e0 = v2 - v1
     """
-    cross = np.cross(e2, e0)
-    area = 0.5 * np.linalg.norm(cross, axis=1)
+    # 叉积分量直接展开，避免 np.cross 的中间 (M,3) 数组
+    cx = e2[:,1]*e0[:,2] - e2[:,2]*e0[:,1]
+    cy = e2[:,2]*e0[:,0] - e2[:,0]*e0[:,2]
+    cz = e2[:,0]*e0[:,1] - e2[:,1]*e0[:,0]
+    area = 0.5 * np.sqrt(cx*cx + cy*cy + cz*cz)
     return area
 
-def triangle_angles(a, b, c):
+def triangle_angles(area, a2, b2, c2):
     """
-    Calculate the three internal angles (radians → degrees) using the law of cosines,
-    and clip values to avoid floating-point errors.
+    Calculate the three internal angles (radians → degrees) with the atan2 form:
+      A = atan2(|e_b x e_c|, e_b · e_c) = atan2(4*Area, b^2 + c^2 - a^2)
+    which reuses the area, needs no division or clipping, and stays accurate
+    for near-degenerate triangles (unlike arccos of the law of cosines).
+    Faces with a zero-length edge (repeated vertex) have undefined angles and
+    get NaN for all three; the fused kernels match this.
+    Takes squared edge lengths (see triangle_edges).
     Angle A corresponds to side a (opposite v0), and so on.
     """
-    # 余弦值裁剪到 [-1,1]
-    def safe_acos(x):
-        return np.arccos(np.clip(x, -1.0, 1.0))
-
-    # 余弦定理：
-    # cos(A) = (b^2 + c^2 - a^2) / (2bc)
-    cosA = (b*b + c*c - a*a) / (2.0 * b * c + 1e-15)
-    cosB = (c*c + a*a - b*b) / (2.0 * c * a + 1e-15)
-    cosC = (a*a + b*b - c*c) / (2.0 * a * b + 1e-15)
-
-    A = np.degrees(safe_acos(cosA))
-    B = np.degrees(safe_acos(cosB))
-    C = np.degrees(safe_acos(cosC))
-    return A, B, C
-
-def triangle_inradius(area, a, b, c):
+    # 三个角放在同一个 (3,M) 数组中，一次 arctan2 / 转角度
+    ang = np.empty((3, a2.shape[0]), dtype=np.result_type(area, a2, b2, c2))
+    for row, (p2, q2, r2) in enumerate(((b2, c2, a2), (c2, a2, b2), (a2, b2, c2))):
+        np.add(p2, q2, out=ang[row])
+        np.subtract(ang[row], r2, out=ang[row])
+
+    np.arctan2(4.0 * area, ang, out=ang)
+    ang *= (180.0 / np.pi)
+    # 有零长边（重复顶点）时内角无定义，记为 NaN
+    np.copyto(ang, np.nan, where=(a2 == 0) | (b2 == 0) | (c2 == 0))
+    return ang[0], ang[1], ang[2]
+
+def triangle_inradius(area, a, b, c, out=None):
     """
     内切圆半径 r = Area / s, 其中 s 为半周长 (a+b+c)/2
+    out: 可选的 (M,) 输出数组（原地写入，避免分配）
     """
-    s = 0.5 * (a + b + c)
-    r = np.where(s > 0, area / s, 0.0)
-    return r
+    s = np.add(a, b, out=out)
+    np.add(s, c, out=s)
+    s *= 0.5
+    # s=0 的位置保持为 0
+    np.divide(area, s, out=s, where=s > 0)
+    return s
 
-def triangle_circumradius(area, a, b, c):
+def triangle_circumradius(area, a, b, c, out=None):
     """
     外接圆半径 R = (a*b*c) / (4*Area)
-    对面积很小的三角形做保护。
+    对面积很小的三角形做保护（R = inf）。
+    out: 可选的 (M,) 输出数组（原地写入，避免分配）
     """
-    R = np.zeros_like(area)
-    mask = area > 1e-20
-    R[mask] = (a[mask] * b[mask] * c[mask]) / (4.0 * area[mask])
-    R[~mask] = np.inf
+    ok = area > 1e-12
+    R = np.multiply(a, b, out=out)
+    np.multiply(R, c, out=R)
+    np.divide(R, area, out=R, where=ok)
+    R *= 0.25
+    np.copyto(R, np.inf, where=~ok)
     return R
+
+
+def kernel_vertex_dtype(dtype):
+    """
+    Vertex dtype the fused kernels (numba / Cython) accept:
+    float32 stays float32, anything else (float64, int, float16, ...) → float64.
+    """
+    return np.dtype(np.float32) if np.dtype(dtype) == np.float32 else np.dtype(np.float64)
+
+
+if HAS_NUMBA:
+    # fastmath 但不含 'contract'：FMA 收缩会让叉积的两项不再精确抵消，
+    # 使有重复顶点的退化面得到非零面积，与纯 numpy 路径不一致；
+    # 也不含 'nnan'：这类面的内角写为 NaN
+    KERNEL_FASTMATH = {"ninf", "nsz", "arcp"}
+
+    def _per_triangle_metrics_kernel(V, F, a, b, c, area, A, B, C, sq, rr):
+        """
+        Fused per-triangle kernel: one pass over the faces computes
+        edge lengths, area, internal angles, shape_quality and radius_ratio
+        without any (M,3) intermediate arrays.
+        Conventions match triangle_edges / triangle_angles above.
+        Outputs are written in place:
+            a, b, c, area, A, B, C, sq, rr: preallocated (M,) arrays
+        """
+        M = F.shape[0]
+        sqrt3 = math.sqrt(3.0)
+        rad2deg = 180.0 / math.pi
+
+        for i in prange(M):
+            i0 = F[i, 0]
+            i1 = F[i, 1]
+            i2 = F[i, 2]
+            x0 = V[i0, 0]; y0 = V[i0, 1]; z0 = V[i0, 2]
+            x1 = V[i1, 0]; y1 = V[i1, 1]; z1 = V[i1, 2]
+            x2 = V[i2, 0]; y2 = V[i2, 1]; z2 = V[i2, 2]
+
+            # e0 = v2 - v1, e1 = v0 - v2, e2 = v1 - v0
+            e0x = x2 - x1; e0y = y2 - y1; e0z = z2 - z1
+            e1x = x0 - x2; e1y = y0 - y2; e1z = z0 - z2
+            e2x = x1 - x0; e2y = y1 - y0; e2z = z1 - z0
+
+            a2 = e0x*e0x + e0y*e0y + e0z*e0z
+            b2 = e1x*e1x + e1y*e1y + e1z*e1z
+            c2 = e2x*e2x + e2y*e2y + e2z*e2z
+            la = math.sqrt(a2)
+            lb = math.sqrt(b2)
+            lc = math.sqrt(c2)
+
+            # area = 0.5 * || e2 x e0 ||
+            cx = e2y*e0z - e2z*e0y
+            cy = e2z*e0x - e2x*e0z
+            cz = e2x*e0y - e2y*e0x
+            ar = 0.5 * math.sqrt(cx*cx + cy*cy + cz*cz)
+
+            # shape_quality
+            denom = a2 + b2 + c2
+            q = 4.0 * sqrt3 * ar / denom if denom > 0 else 0.0
+
+            # radius_ratio = 2*r_in/R_circ = 8*Area^2 / (s*a*b*c)
+            s = 0.5 * (la + lb + lc)
+            abc = la * lb * lc
+            if ar > 1e-12 and s > 0 and abc > 0:
+                r = 8.0 * ar * ar / (s * abc)
+            else:
+                r = 0.0
+
+            a[i] = la
+            b[i] = lb
+            c[i] = lc
+            area[i] = ar
+            # A = atan2(4*Area, b^2 + c^2 - a^2)，见 triangle_angles
+            if a2 > 0 and b2 > 0 and c2 > 0:
+                A[i] = math.atan2(4.0 * ar, b2 + c2 - a2) * rad2deg
+                B[i] = math.atan2(4.0 * ar, c2 + a2 - b2) * rad2deg
+                C[i] = math.atan2(4.0 * ar, a2 + b2 - c2) * rad2deg
+            else:
+                # 有零长边（重复顶点）时内角无定义
+                A[i] = math.nan
+                B[i] = math.nan
+                C[i] = math.nan
+            sq[i] = max(0.0, min(1.0, q))
+            rr[i] = max(0.0, min(1.0, r))
+
+    @functools.lru_cache(maxsize=2)
+    def compiled_per_triangle_metrics(vertex_dtype):
+        """
+        Return the fused kernel eagerly compiled for an explicit signature
+        (vertex dtype, int32 faces, float32 outputs). vertex_dtype is
+        float32 or float64 (see kernel_vertex_dtype), so at most two
+        variants are compiled, once per process.
+        """
+        real = float32 if vertex_dtype == np.float32 else float64
+        sig = void(real[:, ::1], int32[:, ::1], *([float32[::1]] * 9))
+        return njit(sig, parallel=True, fastmath=KERNEL_FASTMATH, cache=True)(
+            _per_triangle_metrics_kernel
+        )
+
+    def per_triangle_metrics(V, F, a, b, c, area, A, B, C, sq, rr):
+        """
+        Dispatch to the compiled kernel matching V's dtype. V / F must
+        already be C-contiguous float32|float64 / int32 (compute_mesh_quality
+        casts them; see _per_triangle_metrics_kernel for conventions).
+        """
+        compiled_per_triangle_metrics(V.dtype)(V, F, a, b, c, area, A, B, C, sq, rr)
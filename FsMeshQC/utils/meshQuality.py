@@ -1,9 +1,54 @@
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from .geometric_calculation import (
-    triangle_edges, triangle_area_from_edges,
-    triangle_angles, triangle_inradius, triangle_circumradius
+    HAS_NUMBA, triangle_edges, triangle_area_from_edges,
+    triangle_angles, triangle_inradius, triangle_circumradius, kernel_vertex_dtype
 )
 
+try:
+    # 已编译的 Cython/OpenMP 内核优先，其次 numba，最后纯 numpy
+    from .._kernels import per_triangle_metrics
+    HAS_FUSED_KERNEL = True
+except ImportError:
+    HAS_FUSED_KERNEL = HAS_NUMBA
+    if HAS_NUMBA:
+        from .geometric_calculation import per_triangle_metrics
+
+
+METRIC_NAMES = (
+    "area",
+    "edge_a", "edge_b", "edge_c",
+    "min_edge", "max_edge",
+    "angle_A", "angle_B", "angle_C",
+    "min_angle", "max_angle",
+    "shape_quality",
+    "radius_ratio",
+)
+
+
+class QualityTable(Mapping):
+    """
+    逐面片质量指标表（SoA 布局）：
+    所有指标存放在同一个连续的 (K,M) float32 数组 data 中，
+    第 k 行对应 METRIC_NAMES[k]；按名称取值返回该行的视图，
+    因此可以像 dict 一样使用（qdict["shape_quality"]）。
+    """
+
+    def __init__(self, data, names=METRIC_NAMES):
+        self.data = data
+        self.names = tuple(names)
+        self._idx = {k: i for i, k in enumerate(self.names)}
+
+    def __getitem__(self, k):
+        return self.data[self._idx[k]]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
 
 def compute_mesh_quality(V, F):
     """
@@ -11,48 +56,74 @@ def compute_mesh_quality(V, F):
     of triangle qualities across all triangles in the cortical
     meshes. 
     https://doi.org/10.1016/j.neuroimage.2020.117012
-    计算每个三角形的质量指标，返回 dict（每个键对应 (M,) 数组）
+    计算每个三角形的质量指标，返回 QualityTable（每个键对应 (M,) float32 行）
     指标说明：
         - area: 面积（mm^2）
         - min_edge, max_edge: 最短/最长边
         - min_angle, max_angle: 最小/最大内角（度）
         - shape_quality: 4*sqrt(3)*A / (a^2+b^2+c^2) ∈ (0,1]，等边=1
         - radius_ratio: 2*r_in/R_circ ∈ (0,1]，等边=1
-        - aspect_proxy: 1 / shape_quality，等边=1，越大越瘦长
+    aspect_proxy（1 / shape_quality）不再单独存储，需要时用 aspect_proxy() 计算。
+    """
+    # 一次性分配全部指标，各内核直接写入对应行
+    q = QualityTable(np.empty((len(METRIC_NAMES), F.shape[0]), dtype=np.float32))
+    a, b, c = q["edge_a"], q["edge_b"], q["edge_c"]
+    A, B, C = q["angle_A"], q["angle_B"], q["angle_C"]
+
+    if HAS_FUSED_KERNEL:
+        # 融合内核：一次遍历所有面片
+        # 内核只接受 float32 / float64 顶点；其他 dtype（int、float16 等）在此统一转换
+        per_triangle_metrics(
+            np.ascontiguousarray(V, dtype=kernel_vertex_dtype(V.dtype)),
+            np.ascontiguousarray(F, dtype=np.int32),
+            a, b, c, q["area"], A, B, C, q["shape_quality"], q["radius_ratio"]
+        )
+    else:
+        e0, _, e2, a2, b2, c2 = triangle_edges(V, F)
+        area = q["area"]
+        area[:] = triangle_area_from_edges(e2, e0)  # 任取两条边
+        A[:], B[:], C[:] = triangle_angles(area, a2, b2, c2)
+        np.sqrt(a2, out=a)
+        np.sqrt(b2, out=b)
+        np.sqrt(c2, out=c)
+
+        # 两个可复用的临时数组，下面的运算都通过 out= 原地写入
+        scratch1 = np.empty_like(area)
+        scratch2 = np.empty_like(area)
+
+        # shape_quality（强推，稳健常用）
+        # 直接复用 triangle_edges 给出的边长平方
+        np.add(a2, b2, out=scratch1)
+        np.add(scratch1, c2, out=scratch1)  # denom
+        np.multiply(area, 4.0 * np.sqrt(3.0), out=scratch2)
+        # 避免 0 除
+        sq = q["shape_quality"]
+        sq[:] = 0.0
+        np.divide(scratch2, scratch1, out=sq, where=scratch1 > 0)
+        np.clip(sq, 0.0, 1.0, out=sq)  # 理论上<=1
+
+        # radius_ratio（同样 0~1，等边=1）
+        r_in = triangle_inradius(area, a, b, c, out=scratch1)
+        R_circ = triangle_circumradius(area, a, b, c, out=scratch2)
+        rr = q["radius_ratio"]
+        rr[:] = 0.0
+        np.divide(r_in, R_circ, out=rr, where=np.isfinite(R_circ) & (R_circ > 0))
+        rr *= 2.0
+        np.clip(rr, 0.0, 1.0, out=rr)
+
+    np.minimum(np.minimum(a, b, out=q["min_edge"]), c, out=q["min_edge"])
+    np.maximum(np.maximum(a, b, out=q["max_edge"]), c, out=q["max_edge"])
+    np.minimum(np.minimum(A, B, out=q["min_angle"]), C, out=q["min_angle"])
+    np.maximum(np.maximum(A, B, out=q["max_angle"]), C, out=q["max_angle"])
+    return q
+
+def aspect_proxy(sq):
     """
-    e0, _, e2, a, b, c = triangle_edges(V, F)
-    area = triangle_area_from_edges(e2, e0)  # 任取两条边
-    A, B, C = triangle_angles(a, b, c)
-
-    # shape_quality（强推，稳健常用）
-    denom = (a*a + b*b + c*c)
-    # 避免 0 除
-    sq = np.zeros_like(area)
-    mask = denom > 0
-    sq[mask] = (4.0 * np.sqrt(3.0) * area[mask]) / denom[mask]
-    sq = np.clip(sq, 0.0, 1.0)  # 理论上<=1
-
-    # radius_ratio（同样 0~1，等边=1）
-    r_in = triangle_inradius(area, a, b, c)
-    R_circ = triangle_circumradius(area, a, b, c)
-    rr = np.zeros_like(area)
-    ok = np.isfinite(R_circ) & (R_circ > 0)
-    rr[ok] = 2.0 * r_in[ok] / R_circ[ok]
-    rr = np.clip(rr, 0.0, 1.0)
-
-    out = {
-        "area": area,
-        "edge_a": a, "edge_b": b, "edge_c": c,
-        "min_edge": np.min(np.vstack([a, b, c]), axis=0),
-        "max_edge": np.max(np.vstack([a, b, c]), axis=0),
-        "angle_A": A, "angle_B": B, "angle_C": C,
-        "min_angle": np.min(np.vstack([A, B, C]), axis=0),
-        "max_angle": np.max(np.vstack([A, B, C]), axis=0),
-        "shape_quality": sq,
-        "radius_ratio": rr,
-        "aspect_proxy": np.where(sq > 0, 1.0 / sq, np.inf),
-    }
-    return out
+    aspect_proxy = 1 / shape_quality，等边=1，越大越瘦长；sq=0 时为 inf
+    """
+    ap = np.full_like(sq, np.inf)
+    np.divide(1.0, sq, out=ap, where=sq > 0)
+    return ap
 
 def summarize_quality(qdict):
     """
@@ -62,18 +133,32 @@ def summarize_quality(qdict):
         x = x[np.isfinite(x)]
         if x.size == 0:
             return {"n": 0}
+        # 一次 np.quantile 调用（内部只做一次 partition）得到全部分位数，
+        # 0/1 分位即最小/最大值
+        q_min, p05, p25, median, p75, p95, q_max = np.quantile(
+            x, [0.0, 0.05, 0.25, 0.5, 0.75, 0.95, 1.0]
+        )
         return {
             "n": x.size,
-            "mean": float(np.mean(x)),
-            "median": float(np.median(x)),
-            "p05": float(np.percentile(x, 5)),
-            "p25": float(np.percentile(x, 25)),
-            "p75": float(np.percentile(x, 75)),
-            "p95": float(np.percentile(x, 95)),
-            "min": float(np.min(x)),
-            "max": float(np.max(x)),
+            "mean": float(x.sum() / x.size),
+            "median": float(median),
+            "p05": float(p05),
+            "p25": float(p25),
+            "p75": float(p75),
+            "p95": float(p95),
+            "min": float(q_min),
+            "max": float(q_max),
         }
 
     keys_of_interest = ["shape_quality", "radius_ratio", "aspect_proxy",
                         "min_angle", "max_angle", "area", "min_edge", "max_edge"]
-    return {k: stats(qdict[k]) for k in keys_of_interest}
+    def metric(k):
+        # aspect_proxy 由 shape_quality 现算
+        if k == "aspect_proxy":
+            return aspect_proxy(qdict["shape_quality"])
+        return qdict[k]
+
+    # 各指标相互独立，numpy 的 partition 会释放 GIL，用线程并行
+    with ThreadPoolExecutor(max_workers=min(8, len(keys_of_interest))) as ex:
+        results = ex.map(lambda k: stats(metric(k)), keys_of_interest)
+        return dict(zip(keys_of_interest, results))
@@ -1,12 +1,60 @@
 import json
+from collections.abc import Mapping
 from pathlib import Path
 import numpy as np
 import pandas as pd
-from .meshQuality import summarize_quality
+from .meshQuality import summarize_quality, aspect_proxy
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:  # pyarrow 为可选依赖，CSV / Parquet 回退到 pandas
+    HAS_PYARROW = False
+
+
+def face_columns(qdict: Mapping, F: np.ndarray, idx: np.ndarray = None):
+    """
+    构建逐面片输出表的列（dict: 列名 -> (M,) 数组）。
+    idx 为 None 时直接引用 qdict 中的整列（不复制）；
+    否则只取 idx 对应的面片。
+    """
+    sel = slice(None) if idx is None else idx
+    sq = qdict["shape_quality"][sel]
+    return {
+        "face_id": np.arange(F.shape[0]) if idx is None else idx,
+        "v0": F[sel, 0], "v1": F[sel, 1], "v2": F[sel, 2],
+        "area": qdict["area"][sel],
+        "edge_a": qdict["edge_a"][sel], "edge_b": qdict["edge_b"][sel], "edge_c": qdict["edge_c"][sel],
+        "min_edge": qdict["min_edge"][sel], "max_edge": qdict["max_edge"][sel],
+        "angle_A": qdict["angle_A"][sel], "angle_B": qdict["angle_B"][sel], "angle_C": qdict["angle_C"][sel],
+        "min_angle": qdict["min_angle"][sel], "max_angle": qdict["max_angle"][sel],
+        "shape_quality": sq,
+        "radius_ratio": qdict["radius_ratio"][sel],
+        "aspect_proxy": aspect_proxy(sq),
+    }
+
+
+def write_csv(columns: dict, path: str, table=None):
+    """
+    写出 CSV：有 pyarrow 时用其 C++ 写出器，否则用 pandas。
+    两种情况下表头均为不加引号的列名，逐面片表与坏三角形表格式一致。
+    table: 可选，已由 columns 构建好的 Arrow 表（避免重复构建）
+    """
+    if HAS_PYARROW:
+        if table is None:
+            table = pa.table(columns)
+        # pyarrow 默认给表头加引号；表头由此处写出
+        with open(path, "wb") as f:
+            f.write((",".join(table.column_names) + "\n").encode("utf-8"))
+            pa_csv.write_csv(table, f, pa_csv.WriteOptions(include_header=False))
+    else:
+        pd.DataFrame(columns).to_csv(path, index=False)
 
 
 def save_mesh_quality(
-    qdict: dict,
+    qdict: Mapping,
     F: np.ndarray,
     out_prefix: str,
     save_csv: bool = True,
@@ -14,7 +62,8 @@ def save_mesh_quality(
     save_npz: bool = True,
     save_summary_json: bool = True,
     bad_sq_thresh: float = 0.2,       # shape_quality 低于此值视为“坏”
-    bad_minangle_thresh: float = 10.0 # 最小角小于此阈值（度）视为“坏”
+    bad_minangle_thresh: float = 10.0, # 最小角小于此阈值（度）视为“坏”
+    bad_mask: np.ndarray = None       # 预先算好的坏三角形掩码（若提供则不再按阈值重算）
 ):
     """
     将 mesh quality 结果保存到文件：
@@ -26,36 +75,42 @@ def save_mesh_quality(
     out_dir = out_prefix.parent
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    # 坏三角形掩码先行，后续导出只需其索引
+    if bad_mask is None:
+        bad_mask = (qdict["shape_quality"] < bad_sq_thresh) | (qdict["min_angle"] < bad_minangle_thresh)
+    bad_idx = np.flatnonzero(bad_mask)
+
     # ---- 1) 逐面片指标表 ----
-    face_ids = np.arange(F.shape[0])
-    faces_df = pd.DataFrame({
-        "face_id": face_ids,
-        "v0": F[:, 0], "v1": F[:, 1], "v2": F[:, 2],
-        "area": qdict["area"],
-        "edge_a": qdict["edge_a"], "edge_b": qdict["edge_b"], "edge_c": qdict["edge_c"],
-        "min_edge": qdict["min_edge"], "max_edge": qdict["max_edge"],
-        "angle_A": qdict["angle_A"], "angle_B": qdict["angle_B"], "angle_C": qdict["angle_C"],
-        "min_angle": qdict["min_angle"], "max_angle": qdict["max_angle"],
-        "shape_quality": qdict["shape_quality"],
-        "radius_ratio": qdict["radius_ratio"],
-        "aspect_proxy": qdict["aspect_proxy"],
-    })
+    # 整表仅在需要 CSV / Parquet 时构建；有 pyarrow 时直接由列数组
+    # 构建 Arrow 表（C++ 写出），绕开 pandas；否则回退到 pandas
+    if save_csv or save_parquet:
+        columns = face_columns(qdict, F)
+        if HAS_PYARROW:
+            faces_table = pa.table(columns)
+        else:
+            faces_df = pd.DataFrame(columns)
 
-    if save_csv:
-        faces_csv = out_prefix.with_suffix("").as_posix() + "_faces.csv"
-        faces_df.to_csv(faces_csv, index=False)
-        print(f"[saved] {faces_csv}")
+        # Parquet 先写：缺少 Parquet 引擎时在写出任何文件之前报错，
+        # 避免只留下部分结果
+        if save_parquet:
+            faces_parquet = out_prefix.with_suffix("").as_posix() + "_faces.parquet"
+            if HAS_PYARROW:
+                pq.write_table(faces_table, faces_parquet, compression="zstd")
+            else:
+                # pandas 自动选择可用引擎（如 fastparquet）
+                faces_df.to_parquet(faces_parquet, index=False)
+            print(f"[saved] {faces_parquet}")
 
-    if save_parquet:
-        faces_parquet = out_prefix.with_suffix("").as_posix() + "_faces.parquet"
-        faces_df.to_parquet(faces_parquet, index=False)
-        print(f"[saved] {faces_parquet}")
+        if save_csv:
+            faces_csv = out_prefix.with_suffix("").as_posix() + "_faces.csv"
+            write_csv(columns, faces_csv, faces_table if HAS_PYARROW else None)
+            print(f"[saved] {faces_csv}")
 
     if save_npz:
         faces_npz = out_prefix.with_suffix("").as_posix() + "_faces.npz"
-        np.savez_compressed(
+        np.savez(
             faces_npz,
-            face_id=face_ids, F=F,
+            face_id=np.arange(F.shape[0]), F=F,
             area=qdict["area"],
             edge_a=qdict["edge_a"], edge_b=qdict["edge_b"], edge_c=qdict["edge_c"],
             min_edge=qdict["min_edge"], max_edge=qdict["max_edge"],
@@ -63,7 +118,6 @@ def save_mesh_quality(
             min_angle=qdict["min_angle"], max_angle=qdict["max_angle"],
             shape_quality=qdict["shape_quality"],
             radius_ratio=qdict["radius_ratio"],
-            aspect_proxy=qdict["aspect_proxy"],
         )
         print(f"[saved] {faces_npz}")
 
@@ -76,13 +130,11 @@ def save_mesh_quality(
         print(f"[saved] {summary_json}")
 
     # ---- 3) 坏三角形导出 ----
-    bad_mask = (qdict["shape_quality"] < bad_sq_thresh) | (qdict["min_angle"] < bad_minangle_thresh)
-    bad_idx = np.where(bad_mask)[0]
     if bad_idx.size > 0:
-        bad_df = faces_df.loc[bad_idx].copy()
-        bad_df.sort_values(by=["shape_quality", "min_angle"], inplace=True)
+        # 按 (shape_quality, min_angle) 稳定排序后，只取坏三角形子集写出
+        order = np.lexsort((qdict["min_angle"][bad_idx], qdict["shape_quality"][bad_idx]))
         bad_csv = out_prefix.with_suffix("").as_posix() + "_bad_faces.csv"
-        bad_df.to_csv(bad_csv, index=False)
+        write_csv(face_columns(qdict, F, bad_idx[order]), bad_csv)
         print(f"[saved] {bad_csv}  (n_bad={bad_idx.size})")
     else:
         print("[info] no bad faces under current thresholds.")
@@ -1,9 +1,43 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+from setuptools.command.build_ext import build_ext
+
+
+class BuildExt(build_ext):
+    """按编译器选择优化 / OpenMP 参数（MSVC 与 GCC/clang 的写法不同）"""
+
+    def build_extensions(self):
+        if self.compiler.compiler_type == "msvc":
+            compile_args, link_args = ["/O2", "/openmp"], []
+        else:
+            # 不用 -ffast-math，并关闭 FMA 收缩，使退化面的叉积精确为 0（与 numpy 路径一致）
+            compile_args = ["-O3", "-fopenmp", "-fno-fast-math", "-ffp-contract=off"]
+            link_args = ["-fopenmp"]
+        for ext in self.extensions:
+            ext.extra_compile_args = compile_args
+            ext.extra_link_args = link_args
+        super().build_extensions()
+
+
+# 可选：安装时若有 Cython，则编译 OpenMP 版的逐三角形内核 FsMeshQC._kernels；
+# optional=True 使编译失败（无编译器 / 无 OpenMP 等）时仅跳过该扩展，
+# 运行时回退到 numba 或纯 numpy
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension("FsMeshQC._kernels", ["FsMeshQC/_kernels.pyx"])],
+        compiler_directives={"language_level": 3},
+    )
+    for ext in ext_modules:
+        ext.optional = True  # cythonize 不保留 Extension(optional=...)，需在此设置
+except ImportError:
+    ext_modules = []
 
 setup(
     name="FsMeshQC",
     version="0.1.0",
     packages=find_packages(),
+    ext_modules=ext_modules,
+    cmdclass={"build_ext": BuildExt},
     description="FreeSurfer Mesh Quality Control Tool",
     long_description=open("README.md", encoding="utf-8").read(),
     long_description_content_type="text/markdown",
@@ -15,6 +49,10 @@ setup(
         "nibabel",
         "pandas",
     ],
+    extras_require={
+        "numba": ["numba"],
+        "parquet": ["pyarrow"],
+    },
     python_requires=">=3.6",
     classifiers=[
         "Programming Language :: Python :: 3",
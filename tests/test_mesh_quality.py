@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from FsMeshQC.utils import geometric_calculation, meshQuality
+from FsMeshQC.utils.meshQuality import METRIC_NAMES, compute_mesh_quality
+
+try:
+    from FsMeshQC._kernels import per_triangle_metrics as cython_kernel
+except ImportError:
+    cython_kernel = None
+
+
+# 固定网格：等边、直角（直角在 v0）、共线、重复顶点，以及若干随机三角形
+V = np.array([
+    [0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.5, np.sqrt(3.0) / 2, 0.0],
+    [0.0, 0.0, 1.0], [1.0, 0.0, 1.0], [0.0, 1.0, 1.0],
+    [2.0, 0.0, 0.0], [3.0, 0.0, 0.0], [4.0, 0.0, 0.0],
+], dtype=np.float32)
+F = np.array([
+    [0, 1, 2],  # equilateral
+    [3, 4, 5],  # right triangle
+    [6, 7, 8],  # collinear
+    [0, 1, 0],  # repeated vertex
+], dtype=np.int32)
+
+rng = np.random.default_rng(0)
+V_RAND = rng.normal(scale=10.0, size=(300, 3)).astype(np.float32)
+F_RAND = rng.permuted(np.tile(np.arange(300), (100, 1)), axis=1)[:, :3].astype(np.int32)
+# 随机坐标上的重复顶点面 [i, j, i]：面积必须精确为 0（FMA 收缩会破坏这一点）
+F_REPEAT = np.c_[np.arange(0, 100), np.arange(100, 200), np.arange(0, 100)].astype(np.int32)
+
+FUSED_KERNELS = {}
+if geometric_calculation.HAS_NUMBA:
+    FUSED_KERNELS["numba"] = geometric_calculation.per_triangle_metrics
+if cython_kernel is not None:
+    FUSED_KERNELS["cython"] = cython_kernel
+
+
+def quality(monkeypatch, path, V, F):
+    """在指定路径（numpy / numba / cython）上计算质量指标"""
+    if path == "numpy":
+        monkeypatch.setattr(meshQuality, "HAS_FUSED_KERNEL", False)
+    else:
+        monkeypatch.setattr(meshQuality, "HAS_FUSED_KERNEL", True)
+        monkeypatch.setattr(meshQuality, "per_triangle_metrics", FUSED_KERNELS[path], raising=False)
+    return compute_mesh_quality(V, F)
+
+
+ALL_PATHS = ["numpy"] + sorted(FUSED_KERNELS)
+
+
+@pytest.mark.parametrize("path", ALL_PATHS)
+def test_reference_triangles(monkeypatch, path):
+    q = quality(monkeypatch, path, V, F)
+    tol = dict(rtol=1e-5, atol=1e-4)
+
+    # 等边
+    np.testing.assert_allclose(q["shape_quality"][0], 1.0, **tol)
+    np.testing.assert_allclose(q["radius_ratio"][0], 1.0, **tol)
+    np.testing.assert_allclose([q["angle_A"][0], q["angle_B"][0], q["angle_C"][0]], 60.0, **tol)
+
+    # 直角三角形
+    np.testing.assert_allclose(q["area"][1], 0.5, **tol)
+    np.testing.assert_allclose([q["angle_A"][1], q["angle_B"][1], q["angle_C"][1]], [90.0, 45.0, 45.0], **tol)
+    np.testing.assert_allclose(q["shape_quality"][1], np.sqrt(3.0) / 2, **tol)
+    np.testing.assert_allclose(q["radius_ratio"][1], 2.0 * np.sqrt(2.0) - 2.0, **tol)
+
+    # 共线 / 重复顶点：面积与质量为 0
+    for i in (2, 3):
+        assert q["area"][i] == 0.0
+        assert q["shape_quality"][i] == 0.0
+        assert q["radius_ratio"][i] == 0.0
+    np.testing.assert_allclose([q["angle_A"][2], q["angle_B"][2], q["angle_C"][2]], [0.0, 180.0, 0.0], **tol)
+    # 重复顶点：内角无定义
+    for k in ("angle_A", "angle_B", "angle_C", "min_angle", "max_angle"):
+        assert np.isnan(q[k][3]), k
+
+
+@pytest.mark.parametrize("path", sorted(FUSED_KERNELS))
+@pytest.mark.parametrize("mesh", [(V, F), (V_RAND, F_RAND)], ids=["reference", "random"])
+def test_fused_kernel_matches_numpy(monkeypatch, path, mesh):
+    ref = quality(monkeypatch, "numpy", *mesh)
+    q = quality(monkeypatch, path, *mesh)
+    for k in METRIC_NAMES:
+        np.testing.assert_allclose(q[k], ref[k], rtol=1e-5, atol=1e-4, err_msg=k)
+
+
+@pytest.mark.parametrize("path", ALL_PATHS)
+@pytest.mark.parametrize("dtype", [np.int64, np.float16, np.float64])
+def test_vertex_dtypes(monkeypatch, path, dtype):
+    Vt = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=dtype)
+    q = quality(monkeypatch, path, Vt, np.array([[0, 1, 2]]))
+    np.testing.assert_allclose(q["shape_quality"], [np.sqrt(3.0) / 2], rtol=1e-5)
+
+
+@pytest.mark.parametrize("path", ALL_PATHS)
+def test_repeated_vertex_is_exactly_degenerate(monkeypatch, path):
+    q = quality(monkeypatch, path, V_RAND, F_REPEAT)
+    for k in ("area", "shape_quality", "radius_ratio"):
+        np.testing.assert_array_equal(q[k], 0.0, err_msg=k)
+    for k in ("angle_A", "angle_B", "angle_C", "min_angle", "max_angle"):
+        assert np.isnan(q[k]).all(), k
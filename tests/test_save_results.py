@@ -0,0 +1,117 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from FsMeshQC.utils import saveResults
+from FsMeshQC.utils.meshQuality import METRIC_NAMES, compute_mesh_quality, summarize_quality
+from FsMeshQC.utils.saveResults import face_columns, save_mesh_quality
+
+
+# 随机网格，末尾追加一个重复顶点面（NaN 内角、inf aspect_proxy）
+rng = np.random.default_rng(1)
+V = rng.normal(scale=10.0, size=(200, 3)).astype(np.float32)
+F = np.vstack([
+    rng.permuted(np.tile(np.arange(200), (150, 1)), axis=1)[:, :3],
+    [[0, 1, 0]],
+]).astype(np.int32)
+
+COLUMNS = ["face_id", "v0", "v1", "v2", "area", "edge_a", "edge_b", "edge_c",
+           "min_edge", "max_edge", "angle_A", "angle_B", "angle_C",
+           "min_angle", "max_angle", "shape_quality", "radius_ratio", "aspect_proxy"]
+
+WRITERS = ["pandas"]
+if saveResults.HAS_PYARROW:
+    WRITERS.append("pyarrow")
+
+
+@pytest.fixture
+def q():
+    return compute_mesh_quality(V, F)
+
+
+def save(monkeypatch, writer, q, prefix, **kwargs):
+    """在指定写出路径（pyarrow / pandas 回退）上保存全部输出"""
+    if writer == "pandas":
+        monkeypatch.setattr(saveResults, "HAS_PYARROW", False)
+    save_mesh_quality(q, F, prefix, save_csv=True, save_parquet=True,
+                      save_npz=True, save_summary_json=True, **kwargs)
+
+
+def assert_table_equal(df, q, idx):
+    """df 的各列与 face_columns(q, F, idx) 一致"""
+    expected = face_columns(q, F, idx)
+    for k in COLUMNS:
+        np.testing.assert_allclose(df[k].to_numpy(), expected[k], rtol=1e-6, err_msg=k)
+
+
+@pytest.mark.parametrize("writer", WRITERS)
+def test_round_trip(monkeypatch, tmp_path, q, writer):
+    if writer == "pandas" and not saveResults.HAS_PYARROW:
+        pytest.importorskip("fastparquet")  # pandas 需要其他 Parquet 引擎
+    prefix = tmp_path / "mesh"
+    save(monkeypatch, writer, q, prefix)
+
+    # CSV：表头不加引号，两个 CSV 格式一致
+    for name in ("faces", "bad_faces"):
+        with open(tmp_path / f"mesh_{name}.csv", encoding="utf-8") as f:
+            assert f.readline().rstrip("\n") == ",".join(COLUMNS), name
+
+    faces = pd.read_csv(tmp_path / "mesh_faces.csv")
+    assert list(faces.columns) == COLUMNS
+    assert_table_equal(faces, q, None)
+
+    parquet = pd.read_parquet(tmp_path / "mesh_faces.parquet")
+    assert list(parquet.columns) == COLUMNS
+    assert_table_equal(parquet, q, None)
+
+    # NPZ 不含 aspect_proxy（可由 1 / shape_quality 得到），其余与 q 完全一致
+    with np.load(tmp_path / "mesh_faces.npz") as npz:
+        assert set(npz.files) == {"face_id", "F"} | set(METRIC_NAMES)
+        np.testing.assert_array_equal(npz["face_id"], np.arange(F.shape[0]))
+        np.testing.assert_array_equal(npz["F"], F)
+        for k in METRIC_NAMES:
+            np.testing.assert_array_equal(npz[k], q[k], err_msg=k)
+
+    with open(tmp_path / "mesh_summary.json", encoding="utf-8") as f:
+        summary = json.load(f)
+    assert summary == json.loads(json.dumps(summarize_quality(q)))
+
+
+@pytest.mark.parametrize("writer", WRITERS)
+def test_bad_faces_follow_mask(monkeypatch, tmp_path, q, writer):
+    bad_mask = np.zeros(F.shape[0], dtype=bool)
+    bad_mask[::7] = True
+    bad_mask[-1] = True  # 重复顶点面：min_angle 为 NaN
+    prefix = tmp_path / "mesh"
+    if writer == "pandas":
+        monkeypatch.setattr(saveResults, "HAS_PYARROW", False)
+    save_mesh_quality(q, F, prefix, save_csv=False, save_npz=False,
+                      save_summary_json=False, bad_mask=bad_mask)
+    assert not (tmp_path / "mesh_faces.csv").exists()
+
+    bad = pd.read_csv(tmp_path / "mesh_bad_faces.csv")
+    # 行恰为掩码选中的面，按 (shape_quality, min_angle) 稳定排序
+    expected = pd.DataFrame(face_columns(q, F, np.flatnonzero(bad_mask))).sort_values(
+        by=["shape_quality", "min_angle"], kind="stable"
+    )
+    np.testing.assert_array_equal(bad["face_id"].to_numpy(), expected["face_id"].to_numpy())
+    assert_table_equal(bad, q, expected["face_id"].to_numpy())
+
+
+def test_bad_faces_from_thresholds(tmp_path, q):
+    save_mesh_quality(q, F, tmp_path / "mesh", save_csv=False, save_npz=False,
+                      save_summary_json=False, bad_sq_thresh=0.5, bad_minangle_thresh=20.0)
+    bad = pd.read_csv(tmp_path / "mesh_bad_faces.csv")
+    mask = (q["shape_quality"] < 0.5) | (q["min_angle"] < 20.0)
+    assert sorted(bad["face_id"]) == list(np.flatnonzero(mask))
+    assert F.shape[0] - 1 in set(bad["face_id"])  # 重复顶点面仍判为坏
+
+
+def test_summarize_quality_accepts_plain_dict(q):
+    from_table = summarize_quality(q)
+    from_dict = summarize_quality({k: q[k].copy() for k in q})
+    assert from_dict == from_table
+    assert from_table["max_angle"]["min"] >= 60.0  # NaN 内角被剔除
+    assert from_table["max_angle"]["n"] == F.shape[0] - 1